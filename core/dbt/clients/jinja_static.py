@@ -1,20 +1,77 @@
+import functools
+
 import jinja2
+from jinja2.nodes import Add, Call, Const, Getattr, List, Name, Node, TemplateData
 from dbt.clients.jinja import get_environment
 from dbt.exceptions import raise_compiler_error
 
 
-def statically_extract_macro_calls(string, ctx, db_wrapper=None):
+@functools.lru_cache(maxsize=4)
+def _static_env(capture_macros: bool) -> jinja2.Environment:
+    # Environments are safe to share for parsing, so build this one only once
+    # instead of for every macro
+    return get_environment(None, capture_macros=capture_macros)
+
+
+# node types that never have child nodes, so there is no need to look inside
+_LEAF_NODES = frozenset((Const, Name, TemplateData))
+
+
+def _iter_calls(node):
+    # Yields every Call below node in the same (pre-)order as
+    # node.find_all(Call), but walks the tree with an explicit stack instead
+    # of a recursive generator per node. Children are found by reading each
+    # node class's declared fields directly, and leaf nodes are skipped.
+    stack = list(node.iter_child_nodes())
+    stack.reverse()
+    while stack:
+        child = stack.pop()
+        child_type = type(child)
+        if child_type is Call:
+            yield child
+        elif child_type in _LEAF_NODES:
+            continue
+        for field in reversed(child_type.fields):
+            item = getattr(child, field, None)
+            if isinstance(item, list):
+                stack.extend(n for n in reversed(item) if isinstance(n, Node))
+            elif isinstance(item, Node):
+                stack.append(item)
+
+
+# the sequences that open a jinja block, statement or comment
+_JINJA_START_SEQS = ('{{', '{%', '{#')
+
+# calls that are never macros
+_STANDARD_CALLS = frozenset(('source', 'ref', 'config'))
+
+
+def _parse_template(string):
     # set 'capture_macros' to capture undefined
-    env = get_environment(None, capture_macros=True)
-    parsed = env.parse(string)
+    env = _static_env(True)
+    return env.parse(string)
 
-    standard_calls = ['source', 'ref', 'config']
-    possible_macro_calls = []
-    for func_call in parsed.find_all(jinja2.nodes.Call):
-        func_name = None
-        if hasattr(func_call, 'node') and hasattr(func_call.node, 'name'):
-            func_name = func_call.node.name
-        else:
+
+def _match_getattr_call(func_call):
+    # Matches the fixed shape of a '<name>.<attr>(...)' call, i.e.
+    # Call(node=Getattr(node=Name(name=<name>), attr=<attr>)), and returns
+    # (<name>, <attr>), or None if func_call has any other shape.
+    node = func_call.node
+    if type(node) is Getattr and type(node.node) is Name:
+        return node.node.name, node.attr
+    return None
+
+
+def _classify_calls(parsed):
+    # Walks the template once and buckets its calls into plain macro names
+    # ('my_macro', 'dbt_utils.current_timestamp') and adapter.dispatch calls,
+    # which are rare and need their own handling.
+    macro_names = []
+    dispatch_calls = []
+    add_macro_name = macro_names.append
+    for func_call in _iter_calls(parsed):
+        func_name = getattr(func_call.node, 'name', None)
+        if func_name is None:
             # func_call for dbt_utils.current_timestamp macro
             # Call(
             #   node=Getattr(
@@ -30,33 +87,56 @@ def statically_extract_macro_calls(string, ctx, db_wrapper=None):
             #   dyn_args=None,
             #   dyn_kwargs=None
             # )
-            if (hasattr(func_call, 'node') and
-                    hasattr(func_call.node, 'node') and
-                    type(func_call.node.node).__name__ == 'Name' and
-                    hasattr(func_call.node, 'attr')):
-                package_name = func_call.node.node.name
-                macro_name = func_call.node.attr
-                if package_name == 'adapter':
-                    if macro_name == 'dispatch':
-                        ad_macro_calls = statically_parse_adapter_dispatch(
-                            func_call, ctx, db_wrapper)
-                        possible_macro_calls.extend(ad_macro_calls)
-                    else:
-                        # This skips calls such as adapter.parse_index
-                        continue
-                else:
-                    func_name = f'{package_name}.{macro_name}'
-            else:
+            matched = _match_getattr_call(func_call)
+            if matched is None:
                 continue
-        if not func_name:
-            continue
-        if func_name in standard_calls:
-            continue
-        elif ctx.get(func_name):
+            package_name, macro_name = matched
+            if package_name == 'adapter':
+                if macro_name == 'dispatch':
+                    dispatch_calls.append(func_call)
+                # This skips calls such as adapter.parse_index
+                continue
+            func_name = f'{package_name}.{macro_name}'
+        if func_name:
+            add_macro_name(func_name)
+    return macro_names, dispatch_calls
+
+
+# Parsing and classifying the calls in a template is purely a function of the
+# source string, and the same macro bodies are seen repeatedly (shared macros,
+# repeated parse cycles), so cache both, including the adapter.dispatch call
+# nodes. Only resolving those dispatch calls depends on ctx and the adapter,
+# so that part is still done on every call. The cached values are tuples so
+# that callers can't mutate them.
+@functools.lru_cache(maxsize=4096)
+def _template_calls(string):
+    macro_names, dispatch_calls = _classify_calls(_parse_template(string))
+    return tuple(macro_names), tuple(dispatch_calls)
+
+
+def statically_extract_macro_calls(string, ctx, db_wrapper=None):
+    # plain SQL can't call any macros, so don't bother parsing it
+    if not any(seq in string for seq in _JINJA_START_SEQS):
+        return []
+
+    macro_names, dispatch_calls = _template_calls(string)
+
+    possible_macro_calls = []
+    for func_call in dispatch_calls:
+        possible_macro_calls.extend(
+            statically_parse_adapter_dispatch(func_call, ctx, db_wrapper)
+        )
+
+    # tracks everything in possible_macro_calls, for cheap membership tests
+    seen = set(possible_macro_calls)
+    add_seen = seen.add
+    add_call = possible_macro_calls.append
+    for func_name in macro_names:
+        if func_name in _STANDARD_CALLS or func_name in ctx:
             continue
-        else:
-            if func_name not in possible_macro_calls:
-                possible_macro_calls.append(func_name)
+        if func_name not in seen:
+            add_seen(func_name)
+            add_call(func_name)
 
     return possible_macro_calls
 
@@ -88,10 +168,11 @@ def statically_parse_adapter_dispatch(func_call, ctx, db_wrapper):
     possible_macro_calls = []
     # This captures an adapter.dispatch('<macro_name>') call.
 
+    args = func_call.args
     func_name = None
     # macro_name positional argument
-    if len(func_call.args) > 0:
-        func_name = func_call.args[0].value
+    if len(args) > 0:
+        func_name = args[0].value
     if func_name:
         possible_macro_calls.append(func_name)
 
@@ -101,57 +182,55 @@ def statically_parse_adapter_dispatch(func_call, ctx, db_wrapper):
     packages_arg = None
     packages_arg_type = None
 
-    if len(func_call.args) > 1:
-        packages_arg = func_call.args[1]
+    if len(args) > 1:
+        packages_arg = args[1]
         # This can be a List or a Call
-        packages_arg_type = type(func_call.args[1]).__name__
+        packages_arg_type = type(packages_arg)
 
     # keyword arguments
-    if func_call.kwargs:
-        for kwarg in func_call.kwargs:
-            if kwarg.key == 'packages':
-                # The packages keyword will be deprecated and
-                # eventually removed
-                packages_arg = kwarg.value
-                # This can be a List or a Call
-                packages_arg_type = type(kwarg.value).__name__
-            elif kwarg.key == 'macro_name':
-                # This will remain to enable static resolution
-                if type(kwarg.value).__name__ == 'Const':
-                    func_name = kwarg.value.value
-                    possible_macro_calls.append(func_name)
-                else:
-                    raise_compiler_error(f"The macro_name parameter ({kwarg.value.value}) "
-                                         "to adapter.dispatch was not a string")
-            elif kwarg.key == 'macro_namespace':
-                # This will remain to enable static resolution
-                kwarg_type = type(kwarg.value).__name__
-                if kwarg_type == 'Const':
-                    macro_namespace = kwarg.value.value
-                else:
-                    raise_compiler_error("The macro_namespace parameter to adapter.dispatch "
-                                         f"is a {kwarg_type}, not a string")
+    kwargs = {kwarg.key: kwarg.value for kwarg in func_call.kwargs}
+    if 'packages' in kwargs:
+        # The packages keyword will be deprecated and
+        # eventually removed
+        packages_arg = kwargs['packages']
+        # This can be a List or a Call
+        packages_arg_type = type(packages_arg)
+
+    macro_name_arg = kwargs.get('macro_name')
+    if macro_name_arg is not None:
+        # This will remain to enable static resolution
+        if type(macro_name_arg) is Const:
+            func_name = macro_name_arg.value
+            possible_macro_calls.append(func_name)
+        else:
+            raise_compiler_error(f"The macro_name parameter ({macro_name_arg.value}) "
+                                 "to adapter.dispatch was not a string")
+
+    macro_namespace_arg = kwargs.get('macro_namespace')
+    if macro_namespace_arg is not None:
+        # This will remain to enable static resolution
+        kwarg_type = type(macro_namespace_arg)
+        if kwarg_type is Const:
+            macro_namespace = macro_namespace_arg.value
+        else:
+            raise_compiler_error("The macro_namespace parameter to adapter.dispatch "
+                                 f"is a {kwarg_type.__name__}, not a string")
 
     # positional arguments
     if packages_arg:
-        if packages_arg_type == 'List':
+        if packages_arg_type is List:
             # This will remain to enable static resolution
-            packages = []
-            for item in packages_arg.items:
-                packages.append(item.value)
-        elif packages_arg_type == 'Const':
+            packages = [item.value for item in packages_arg.items]
+        elif packages_arg_type is Const:
             # This will remain to enable static resolution
             macro_namespace = packages_arg.value
-        elif packages_arg_type == 'Call':
+        elif packages_arg_type is Call:
             # This is deprecated and should be removed eventually.
             # It is here to support (hackily) common ways of providing
             # a packages list to adapter.dispatch
-            if (hasattr(packages_arg, 'node') and
-                    hasattr(packages_arg.node, 'node') and
-                    hasattr(packages_arg.node.node, 'name') and
-                    hasattr(packages_arg.node, 'attr')):
-                package_name = packages_arg.node.node.name
-                macro_name = packages_arg.node.attr
+            matched = _match_getattr_call(packages_arg)
+            if matched is not None:
+                package_name, macro_name = matched
                 if (macro_name.startswith('_get') and 'namespaces' in macro_name):
                     # noqa: https://github.com/dbt-labs/dbt-utils/blob/9e9407b/macros/cross_db_utils/_get_utils_namespaces.sql
                     var_name = f'{package_name}_dispatch_list'
@@ -174,21 +253,21 @@ def statically_parse_adapter_dispatch(func_call, ctx, db_wrapper):
                         "for details."
                     ).strip()
                     raise_compiler_error(msg)
-        elif packages_arg_type == 'Add':
+        elif packages_arg_type is Add:
             # This logic is for when there is a variable and an addition of a list,
             # like: packages = (var('local_utils_dispatch_list', []) + ['local_utils2'])
             # This is deprecated and should be removed eventually.
             namespace_var = None
             default_namespaces = []
             # This might be a single call or it might be the 'left' piece in an addition
-            for var_call in packages_arg.find_all(jinja2.nodes.Call):
-                if (hasattr(var_call, 'node') and
-                        var_call.node.name == 'var' and
-                        hasattr(var_call, 'args')):
-                    namespace_var = var_call.args[0].value
-            if hasattr(packages_arg, 'right'):  # we have a default list of namespaces
-                for item in packages_arg.right.items:
-                    default_namespaces.append(item.value)
+            for var_call in _iter_calls(packages_arg):
+                var_args = var_call.args
+                if getattr(var_call.node, 'name', None) == 'var' and var_args:
+                    namespace_var = var_args[0].value
+            # we have a default list of namespaces
+            right = getattr(packages_arg, 'right', None)
+            if right is not None:
+                default_namespaces.extend(item.value for item in right.items)
             if namespace_var:
                 namespace_names = get_dispatch_list(ctx, namespace_var, default_namespaces)
                 packages = []
@@ -215,11 +294,15 @@ def statically_parse_adapter_dispatch(func_call, ctx, db_wrapper):
 
 
 def get_dispatch_list(ctx, var_name, default_packages):
-    namespace_list = None
-    try:
-        # match the logic currently used in package _get_namespaces() macro
-        namespace_list = ctx['var'](var_name) + default_packages
-    except Exception:
-        pass
-    namespace_list = namespace_list if namespace_list else default_packages
-    return namespace_list
+    # match the logic currently used in package _get_namespaces() macro.
+    # Pass a default to var() so that an unset var comes back as None
+    # instead of raising.
+    var_fn = ctx.get('var')
+    if var_fn is None:
+        return default_packages
+    namespace_list = var_fn(var_name, None)
+    if not isinstance(namespace_list, list) or not namespace_list:
+        return default_packages
+    if not default_packages:
+        return namespace_list
+    return namespace_list + default_packages
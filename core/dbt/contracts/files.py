@@ -263,10 +263,16 @@ class SchemaSourceFile(BaseSourceFile):
         if name not in self.tests[key]:
             self.tests[key][name] = []
         self.tests[key][name].append(node_unique_id)
+        # keep the index, if it's been built, up to date
+        if self.pp_test_index is not None:
+            self.pp_test_index[node_unique_id] = (key, name)
 
     def remove_tests(self, yaml_key, name):
         if yaml_key in self.tests:
             if name in self.tests[yaml_key]:
+                if self.pp_test_index is not None:
+                    for unique_id in self.tests[yaml_key][name]:
+                        self.pp_test_index.pop(unique_id, None)
                 del self.tests[yaml_key][name]
 
     def get_tests(self, yaml_key, name):
@@ -275,17 +281,21 @@ class SchemaSourceFile(BaseSourceFile):
                 return self.tests[yaml_key][name]
         return []
 
-    def get_key_and_name_for_test(self, test_unique_id):
-        yaml_key = None
-        block_name = None
+    # pp_test_index is a reverse index of test unique_id to (yaml_key, name),
+    # built the first time it's needed and then kept up to date by add_test
+    # and remove_tests, so that finding a test's key and name doesn't
+    # need to scan all of the tests in the file.
+    def build_test_index(self):
+        self.pp_test_index = {}
         for key in self.tests.keys():
             for name in self.tests[key]:
                 for unique_id in self.tests[key][name]:
-                    if unique_id == test_unique_id:
-                        yaml_key = key
-                        block_name = name
-                        break
-        return (yaml_key, block_name)
+                    self.pp_test_index[unique_id] = (key, name)
+
+    def get_key_and_name_for_test(self, test_unique_id):
+        if self.pp_test_index is None:
+            self.build_test_index()
+        return self.pp_test_index.get(test_unique_id, (None, None))
 
     def get_all_test_ids(self):
         test_ids = []
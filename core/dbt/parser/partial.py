@@ -1,19 +1,20 @@
-from typing import MutableMapping, Dict, List
+from collections import defaultdict
+from typing import MutableMapping, Any, DefaultDict, Dict, List, Set, Tuple
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.files import (
-    AnySourceFile, ParseFileType, parse_file_type_to_parser,
+    AnySourceFile, ParseFileType, SchemaSourceFile, parse_file_type_to_parser,
 )
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.node_types import NodeType
 
 
-mssat_files = (
+mssat_files = frozenset((
     ParseFileType.Model,
     ParseFileType.Seed,
     ParseFileType.Snapshot,
     ParseFileType.Analysis,
     ParseFileType.Test,
-)
+))
 
 
 key_to_prefix = {
@@ -24,6 +25,12 @@ key_to_prefix = {
 }
 
 
+# The keys in a schema file's yaml dictionary that partial parsing handles
+schema_file_keys = (
+    'models', 'seeds', 'snapshots', 'analyses', 'sources', 'macros', 'exposures',
+)
+
+
 parse_file_type_to_key = {
     ParseFileType.Model: 'models',
     ParseFileType.Seed: 'seeds',
@@ -40,11 +47,21 @@ class PartialParsing:
     def __init__(self, saved_manifest: Manifest, new_files: MutableMapping[str, AnySourceFile]):
         self.saved_manifest = saved_manifest
         self.new_files = new_files
-        self.project_parser_files: Dict = {}
+        # project_name -> parser_name -> file_ids. The file_ids are the keys of
+        # a dictionary, which is used as an ordered set.
+        self.project_parser_files: DefaultDict[str, DefaultDict[str, Dict[str, None]]] = \
+            defaultdict(lambda: defaultdict(dict))
         self.saved_files = self.saved_manifest.files
-        self.project_parser_files = {}
-        self.deleted_manifest = Manifest()
+        # The unique_ids (and file_ids) removed from the saved manifest, by
+        # manifest dictionary name ('files', 'nodes', etc)
+        self.deleted: DefaultDict[str, Set[str]] = defaultdict(set)
         self.macro_child_map: Dict[str, List[str]] = {}
+        # indexes of schema file elements by name, by schema file_id
+        self.node_patch_index: Dict[str, Dict[Tuple[str, str], str]] = {}
+        self.exposure_index: Dict[str, Dict[str, List[str]]] = {}
+        self.source_index: Dict[str, Dict[str, List[str]]] = {}
+        # the element names in schema file pp_dicts, by (file_id, key)
+        self.pp_dict_names: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], Set[str]]] = {}
         self.build_file_diff()
         self.processing_file = None
 
@@ -60,41 +77,53 @@ class PartialParsing:
     # Compare the previously saved manifest files and the just-loaded manifest
     # files to see if anything changed
     def build_file_diff(self):
-        saved_file_ids = set(self.saved_files.keys())
-        new_file_ids = set(self.new_files.keys())
-        deleted_all_files = saved_file_ids.difference(new_file_ids)
-        added = new_file_ids.difference(saved_file_ids)
-        common = saved_file_ids.intersection(new_file_ids)
+        saved_files = self.saved_files
+        new_files = self.new_files
+        if saved_files.keys() == new_files.keys():
+            # The usual case, where files have been changed but none added or
+            # deleted. Skip building the sets of file_ids.
+            deleted_all_files = set()
+            added = set()
+            common = saved_files.keys()
+        else:
+            saved_file_ids = set(saved_files.keys())
+            new_file_ids = set(new_files.keys())
+            deleted_all_files = saved_file_ids.difference(new_file_ids)
+            added = new_file_ids.difference(saved_file_ids)
+            common = saved_file_ids.intersection(new_file_ids)
         changed_or_deleted_macro_file = False
 
-        # separate out deleted schema files
-        deleted_schema_files = []
-        deleted = []
+        # separate out deleted schema files. These are sets because
+        # 'deleted' is checked for membership every time a file is scheduled
+        deleted_schema_files = set()
+        deleted = set()
         for file_id in deleted_all_files:
-            if self.saved_files[file_id].parse_file_type == ParseFileType.Schema:
-                deleted_schema_files.append(file_id)
+            parse_file_type = saved_files[file_id].parse_file_type
+            if parse_file_type == ParseFileType.Schema:
+                deleted_schema_files.add(file_id)
             else:
-                if self.saved_files[file_id].parse_file_type == ParseFileType.Macro:
+                if parse_file_type == ParseFileType.Macro:
                     changed_or_deleted_macro_file = True
-                deleted.append(file_id)
+                deleted.add(file_id)
 
         changed = []
         changed_schema_files = []
         unchanged = []
         for file_id in common:
-            if self.saved_files[file_id].checksum == self.new_files[file_id].checksum:
+            saved_file = saved_files[file_id]
+            if saved_file.checksum == new_files[file_id].checksum:
                 unchanged.append(file_id)
+                continue
+            # separate out changed schema files
+            parse_file_type = saved_file.parse_file_type
+            if parse_file_type == ParseFileType.Schema:
+                if not isinstance(saved_file, SchemaSourceFile):
+                    raise Exception(f"Serialization failure for {file_id}")
+                changed_schema_files.append(file_id)
             else:
-                # separate out changed schema files
-                if self.saved_files[file_id].parse_file_type == ParseFileType.Schema:
-                    sf = self.saved_files[file_id]
-                    if type(sf).__name__ != 'SchemaSourceFile':
-                        raise Exception(f"Serialization failure for {file_id}")
-                    changed_schema_files.append(file_id)
-                else:
-                    if self.saved_files[file_id].parse_file_type == ParseFileType.Macro:
-                        changed_or_deleted_macro_file = True
-                    changed.append(file_id)
+                if parse_file_type == ParseFileType.Macro:
+                    changed_or_deleted_macro_file = True
+                changed.append(file_id)
         file_diff = {
             "deleted": deleted,
             "deleted_schema_files": deleted_schema_files,
@@ -118,24 +147,30 @@ class PartialParsing:
             return {}
         # Need to add new files first, because changes in schema files
         # might refer to them
-        for file_id in self.file_diff['added']:
+        file_diff = self.file_diff
+        for file_id in file_diff['added']:
             self.processing_file = file_id
             self.add_to_saved(file_id)
         # Need to process schema files next, because the dictionaries
         # need to be in place for handling SQL file changes
-        for file_id in self.file_diff['changed_schema_files']:
+        for file_id in file_diff['changed_schema_files']:
             self.processing_file = file_id
             self.change_schema_file(file_id)
-        for file_id in self.file_diff['deleted_schema_files']:
+        for file_id in file_diff['deleted_schema_files']:
             self.processing_file = file_id
             self.delete_schema_file(file_id)
-        for file_id in self.file_diff['deleted']:
+        for file_id in file_diff['deleted']:
             self.processing_file = file_id
             self.delete_from_saved(file_id)
-        for file_id in self.file_diff['changed']:
+        for file_id in file_diff['changed']:
             self.processing_file = file_id
             self.update_in_saved(file_id)
-        return self.project_parser_files
+        return {
+            project_name: {
+                parser_name: list(file_ids) for parser_name, file_ids in parser_files.items()
+            }
+            for project_name, parser_files in self.project_parser_files.items()
+        }
 
     # Add the file to the project parser dictionaries to schedule parsing
     def add_to_pp_files(self, source_file):
@@ -145,13 +180,8 @@ class PartialParsing:
         if not parser_name or not project_name:
             raise Exception(f"Did not find parse_file_type or project_name "
                             f"in SourceFile for {source_file.file_id}")
-        if project_name not in self.project_parser_files:
-            self.project_parser_files[project_name] = {}
-        if parser_name not in self.project_parser_files[project_name]:
-            self.project_parser_files[project_name][parser_name] = []
-        if (file_id not in self.project_parser_files[project_name][parser_name] and
-                file_id not in self.file_diff['deleted']):
-            self.project_parser_files[project_name][parser_name].append(file_id)
+        if file_id not in self.file_diff['deleted']:
+            self.project_parser_files[project_name][parser_name][file_id] = None
 
     def already_scheduled_for_parsing(self, source_file):
         file_id = source_file.file_id
@@ -191,19 +221,21 @@ class PartialParsing:
         # nodes, and update pp_files to parse unless the
         # file creating those nodes has also been deleted
         saved_source_file = self.saved_files[file_id]
+        parse_file_type = saved_source_file.parse_file_type
 
         # SQL file: models, seeds, snapshots, analyses, tests: SQL files, except
         # macros/tests
-        if saved_source_file.parse_file_type in mssat_files:
+        if parse_file_type in mssat_files:
             self.remove_mssat_file(saved_source_file)
-            self.deleted_manifest.files[file_id] = self.saved_manifest.files.pop(file_id)
+            self.saved_manifest.files.pop(file_id)
+            self.deleted['files'].add(file_id)
 
         # macros
-        if saved_source_file.parse_file_type == ParseFileType.Macro:
+        elif parse_file_type == ParseFileType.Macro:
             self.delete_macro_file(saved_source_file, follow_references=True)
 
         # docs
-        if saved_source_file.parse_file_type == ParseFileType.Documentation:
+        elif parse_file_type == ParseFileType.Documentation:
             self.delete_doc_node(saved_source_file)
 
         logger.debug(f"Partial parsing: deleted file: {file_id}")
@@ -212,12 +244,13 @@ class PartialParsing:
     def update_in_saved(self, file_id):
         new_source_file = self.new_files[file_id]
         old_source_file = self.saved_files[file_id]
+        parse_file_type = new_source_file.parse_file_type
 
-        if new_source_file.parse_file_type in mssat_files:
+        if parse_file_type in mssat_files:
             self.update_mssat_in_saved(new_source_file, old_source_file)
-        elif new_source_file.parse_file_type == ParseFileType.Macro:
+        elif parse_file_type == ParseFileType.Macro:
             self.update_macro_in_saved(new_source_file, old_source_file)
-        elif new_source_file.parse_file_type == ParseFileType.Documentation:
+        elif parse_file_type == ParseFileType.Documentation:
             self.update_doc_in_saved(new_source_file, old_source_file)
         else:
             raise Exception(f"Invalid parse_file_type in source_file {file_id}")
@@ -237,7 +270,7 @@ class PartialParsing:
 
         # replace source_file in saved and add to parsing list
         file_id = new_source_file.file_id
-        self.deleted_manifest.files[file_id] = old_source_file
+        self.deleted['files'].add(file_id)
         self.saved_files[file_id] = new_source_file
         self.add_to_pp_files(new_source_file)
         self.remove_node_in_saved(new_source_file, unique_id)
@@ -249,7 +282,7 @@ class PartialParsing:
 
         # delete node in saved
         node = self.saved_manifest.nodes.pop(unique_id)
-        self.deleted_manifest.nodes[unique_id] = node
+        self.deleted['nodes'].add(unique_id)
 
         # look at patch_path in model node to see if we need
         # to reapply a patch from a schema_file.
@@ -261,15 +294,13 @@ class PartialParsing:
                 schema_file = self.saved_files[file_id]
                 dict_key = parse_file_type_to_key[source_file.parse_file_type]
                 # look for a matching list dictionary
-                for elem in schema_file.dict_from_yaml[dict_key]:
-                    if elem['name'] == node.name:
-                        elem_patch = elem
-                        break
+                elem_patch = self.get_schema_element(
+                    schema_file.dict_from_yaml.get(dict_key, []), node.name
+                )
                 if elem_patch:
                     self.delete_schema_mssa_links(schema_file, dict_key, elem_patch)
                     self.merge_patch(schema_file, dict_key, elem_patch)
-                    if unique_id in schema_file.node_patches:
-                        schema_file.node_patches.remove(unique_id)
+                    self.remove_node_patch(schema_file, unique_id)
 
     def update_macro_in_saved(self, new_source_file, old_source_file):
         if self.already_scheduled_for_parsing(old_source_file):
@@ -352,15 +383,29 @@ class PartialParsing:
     def delete_macro_file(self, source_file, follow_references=False):
         self.handle_macro_file_links(source_file, follow_references)
         file_id = source_file.file_id
-        self.deleted_manifest.files[file_id] = self.saved_files.pop(file_id)
-
-    def recursively_gather_macro_references(self, macro_unique_id, referencing_nodes):
-        for unique_id in self.macro_child_map[macro_unique_id]:
-            if unique_id in referencing_nodes:
-                continue
-            referencing_nodes.append(unique_id)
-            if unique_id.startswith('macro.'):
-                self.recursively_gather_macro_references(unique_id, referencing_nodes)
+        self.saved_files.pop(file_id)
+        self.deleted['files'].add(file_id)
+
+    # Find everything that depends on a macro, following macros that call
+    # macros, using the macro_child_map. This is a depth-first walk, returning
+    # the unique_ids in the order they're found, using an explicit stack and a
+    # set of the nodes already found.
+    def gather_macro_references(self, macro_unique_id):
+        referencing_nodes = []
+        found = set()
+        stack = [iter(self.macro_child_map[macro_unique_id])]
+        while stack:
+            for unique_id in stack[-1]:
+                if unique_id in found:
+                    continue
+                found.add(unique_id)
+                referencing_nodes.append(unique_id)
+                if unique_id.startswith('macro.'):
+                    stack.append(iter(self.macro_child_map[unique_id]))
+                    break
+            else:
+                stack.pop()
+        return referencing_nodes
 
     def handle_macro_file_links(self, source_file, follow_references=False):
         # remove the macros in the 'macros' dictionary
@@ -373,7 +418,7 @@ class PartialParsing:
                 continue
 
             base_macro = self.saved_manifest.macros.pop(unique_id)
-            self.deleted_manifest.macros[unique_id] = base_macro
+            self.deleted['macros'].add(unique_id)
 
             # Recursively check children of this macro
             # The macro_child_map might not exist if a macro is removed by
@@ -381,8 +426,7 @@ class PartialParsing:
             # references if the macro file itself has been updated or
             # deleted, not if we're just updating referenced nodes.
             if self.macro_child_map and follow_references:
-                referencing_nodes = []
-                self.recursively_gather_macro_references(unique_id, referencing_nodes)
+                referencing_nodes = self.gather_macro_references(unique_id)
                 self.schedule_macro_nodes_for_parsing(referencing_nodes)
 
             if base_macro.patch_path:
@@ -418,8 +462,7 @@ class PartialParsing:
                             if key in ['models', 'seeds', 'snapshots']:
                                 self.delete_schema_mssa_links(schema_file, key, patch)
                                 self.merge_patch(schema_file, key, patch)
-                                if unique_id in schema_file.node_patches:
-                                    schema_file.node_patches.remove(unique_id)
+                                self.remove_node_patch(schema_file, unique_id)
                             elif key == 'sources':
                                 # re-schedule source
                                 if 'overrides' in patch:
@@ -447,10 +490,8 @@ class PartialParsing:
 
     def delete_doc_node(self, source_file):
         # remove the nodes in the 'docs' dictionary
-        docs = source_file.docs.copy()
-        for unique_id in docs:
-            self.deleted_manifest.docs[unique_id] = self.saved_manifest.docs.pop(unique_id)
-            source_file.docs.remove(unique_id)
+        self.move_to_deleted('docs', source_file.docs)
+        source_file.docs = []
         # The unique_id of objects that contain a doc call are stored in the
         # doc source_file.nodes
         self.schedule_nodes_for_parsing(source_file.nodes)
@@ -488,17 +529,27 @@ class PartialParsing:
         saved_yaml_dict = saved_schema_file.dict_from_yaml
         new_yaml_dict = {}
         self.handle_schema_file_changes(saved_schema_file, saved_yaml_dict, new_yaml_dict)
-        self.deleted_manifest.files[file_id] = self.saved_manifest.files.pop(file_id)
+        self.saved_manifest.files.pop(file_id)
+        self.deleted['files'].add(file_id)
 
     # For each key in a schema file dictionary, process the changed, deleted, and added
     # elemnts for the key lists
     def handle_schema_file_changes(self, schema_file, saved_yaml_dict, new_yaml_dict):
         # loop through comparing previous dict_from_yaml with current dict_from_yaml
         # Need to do the deleted/added/changed thing, just like the files lists
+        # Usually only one section of a schema file has changed, and comparing
+        # the sections directly is cheap, so only index and diff the sections
+        # that are different.
+        changed_keys = [
+            key for key in schema_file_keys
+            if saved_yaml_dict.get(key) != new_yaml_dict.get(key)
+        ]
+        saved_yaml_index = self.index_yaml_dict(saved_yaml_dict, changed_keys)
+        new_yaml_index = self.index_yaml_dict(new_yaml_dict, changed_keys)
 
         # models, seeds, snapshots, analyses
         for dict_key in ['models', 'seeds', 'snapshots', 'analyses']:
-            key_diff = self.get_diff_for(dict_key, saved_yaml_dict, new_yaml_dict)
+            key_diff = self.get_diff_for(dict_key, saved_yaml_index, new_yaml_index)
             if key_diff['changed']:
                 for elem in key_diff['changed']:
                     self.delete_schema_mssa_links(schema_file, dict_key, elem)
@@ -511,7 +562,7 @@ class PartialParsing:
                     self.merge_patch(schema_file, dict_key, elem)
 
         # sources
-        source_diff = self.get_diff_for('sources', saved_yaml_dict, new_yaml_dict)
+        source_diff = self.get_diff_for('sources', saved_yaml_index, new_yaml_index)
         if source_diff['changed']:
             for source in source_diff['changed']:
                 if 'overrides' in source:  # This is a source patch; need to re-parse orig source
@@ -532,7 +583,7 @@ class PartialParsing:
                 self.merge_patch(schema_file, 'sources', source)
 
         # macros
-        macro_diff = self.get_diff_for('macros', saved_yaml_dict, new_yaml_dict)
+        macro_diff = self.get_diff_for('macros', saved_yaml_index, new_yaml_index)
         if macro_diff['changed']:
             for macro in macro_diff['changed']:
                 self.delete_schema_macro_patch(schema_file, macro)
@@ -545,7 +596,7 @@ class PartialParsing:
                 self.merge_patch(schema_file, 'macros', macro)
 
         # exposures
-        exposure_diff = self.get_diff_for('exposures', saved_yaml_dict, new_yaml_dict)
+        exposure_diff = self.get_diff_for('exposures', saved_yaml_index, new_yaml_index)
         if exposure_diff['changed']:
             for exposure in exposure_diff['changed']:
                 self.delete_schema_exposure(schema_file, exposure)
@@ -558,35 +609,33 @@ class PartialParsing:
                 self.merge_patch(schema_file, 'exposures', exposure)
 
     # Take a "section" of the schema file yaml dictionary from saved and new schema files
-    # and determine which parts have changed
-    def get_diff_for(self, key, saved_yaml_dict, new_yaml_dict):
-        if key in saved_yaml_dict or key in new_yaml_dict:
-            saved_elements = saved_yaml_dict[key] if key in saved_yaml_dict else []
-            new_elements = new_yaml_dict[key] if key in new_yaml_dict else []
+    # and determine which parts have changed. The yaml dictionaries are passed in
+    # already indexed by section and element name (see 'index_yaml_dict')
+    def get_diff_for(self, key, saved_yaml_index, new_yaml_index):
+        if key in saved_yaml_index or key in new_yaml_index:
+            saved_elements_by_name = saved_yaml_index.get(key, {})
+            new_elements_by_name = new_yaml_index.get(key, {})
         else:
             return {'deleted': [], 'added': [], 'changed': []}
-        # for each set of keys, need to create a dictionary of names pointing to entry
-        saved_elements_by_name = {}
-        new_elements_by_name = {}
-        # sources have two part names?
-        for element in saved_elements:
-            saved_elements_by_name[element['name']] = element
-        for element in new_elements:
-            new_elements_by_name[element['name']] = element
 
         # now determine which elements, by name, are added, deleted or changed
-        saved_element_names = set(saved_elements_by_name.keys())
-        new_element_names = set(new_elements_by_name.keys())
-        deleted = saved_element_names.difference(new_element_names)
-        added = new_element_names.difference(saved_element_names)
-        common = saved_element_names.intersection(new_element_names)
-        changed = []
-        for element_name in common:
-            if saved_elements_by_name[element_name] != new_elements_by_name[element_name]:
-                changed.append(element_name)
-
-        # make lists of yaml elements to return as diffs
-        deleted_elements = [saved_elements_by_name[name].copy() for name in deleted]
+        saved_element_names = saved_elements_by_name.keys()
+        new_element_names = new_elements_by_name.keys()
+        deleted = saved_element_names - new_element_names
+        added = new_element_names - saved_element_names
+        common = saved_element_names & new_element_names
+        # Compare the elements directly: dict comparison happens in C and stops at
+        # the first difference, which is cheaper than serializing and hashing both
+        # sides of every element.
+        changed = [
+            name for name in common
+            if saved_elements_by_name[name] != new_elements_by_name[name]
+        ]
+
+        # make lists of yaml elements to return as diffs. Deleted elements are
+        # only read, but added and changed elements end up in the pp_dict
+        # that's handed to the schema parser, so those are copied.
+        deleted_elements = [saved_elements_by_name[name] for name in deleted]
         added_elements = [new_elements_by_name[name].copy() for name in added]
         changed_elements = [new_elements_by_name[name].copy() for name in changed]
 
@@ -597,6 +646,17 @@ class PartialParsing:
         }
         return diff
 
+    # Create a dictionary of section keys to dictionaries of element names
+    # pointing to the element, so that a schema file's yaml dictionary only
+    # needs to be indexed once, not once per section.
+    def index_yaml_dict(self, yaml_dict, keys=schema_file_keys):
+        yaml_index = {}
+        for key in keys:
+            if key in yaml_dict:
+                # sources have two part names?
+                yaml_index[key] = {element['name']: element for element in yaml_dict[key]}
+        return yaml_index
+
     # Merge a patch file into the pp_dict in a schema file
     def merge_patch(self, schema_file, key, patch):
         if not schema_file.pp_dict:
@@ -604,37 +664,41 @@ class PartialParsing:
         pp_dict = schema_file.pp_dict
         if key not in pp_dict:
             pp_dict[key] = [patch]
+            self.pp_dict_names[(schema_file.file_id, key)] = (pp_dict[key], {patch['name']})
         else:
             # check that this patch hasn't already been saved
-            found = False
-            for elem in pp_dict[key]:
-                if elem['name'] == patch['name']:
-                    found = True
-            if not found:
-                pp_dict[key].append(patch)
+            patches, names = self.get_pp_dict_names(schema_file, key)
+            if patch['name'] not in names:
+                patches.append(patch)
+                names.add(patch['name'])
         self.add_to_pp_files(schema_file)
 
+    # The names of the elements in a schema file's pp_dict list for a key. The
+    # list is stored with its names, so that if the pp_dict or its list is
+    # replaced, the names are collected again.
+    def get_pp_dict_names(self, schema_file, key):
+        patches = schema_file.pp_dict[key]
+        cache_key = (schema_file.file_id, key)
+        cached = self.pp_dict_names.get(cache_key)
+        if cached is None or cached[0] is not patches:
+            cached = (patches, {elem['name'] for elem in patches})
+            self.pp_dict_names[cache_key] = cached
+        return cached
+
     # For model, seed, snapshot, analysis schema dictionary keys,
     # delete the patches and tests from the patch
     def delete_schema_mssa_links(self, schema_file, dict_key, elem):
         # find elem node unique_id in node_patches
         prefix = key_to_prefix[dict_key]
-        elem_unique_id = ''
-        for unique_id in schema_file.node_patches:
-            if not unique_id.startswith(prefix):
-                continue
-            parts = unique_id.split('.')
-            elem_name = parts[-1]
-            if elem_name == elem['name']:
-                elem_unique_id = unique_id
-                break
+        node_patch_index = self.get_node_patch_index(schema_file)
+        elem_unique_id = node_patch_index.get((prefix, elem['name']), '')
 
         # remove elem node and remove unique_id from node_patches
         if elem_unique_id:
             # might have been already removed
             if elem_unique_id in self.saved_manifest.nodes:
                 node = self.saved_manifest.nodes.pop(elem_unique_id)
-                self.deleted_manifest.nodes[elem_unique_id] = node
+                self.deleted['nodes'].add(elem_unique_id)
                 # need to add the node source_file to pp_files
                 file_id = node.file_id
                 # need to copy new file to saved files in order to get content
@@ -644,37 +708,72 @@ class PartialParsing:
                     source_file = self.saved_files[file_id]
                     self.add_to_pp_files(source_file)
             # remove from patches
-            schema_file.node_patches.remove(elem_unique_id)
+            self.remove_node_patch(schema_file, elem_unique_id)
 
         # for models, seeds, snapshots (not analyses)
         if dict_key in ['models', 'seeds', 'snapshots']:
             # find related tests and remove them
             self.remove_tests(schema_file, dict_key, elem['name'])
 
+    # The node_patches in a schema file, by (resource type prefix, name). This is
+    # built the first time a schema file's node patches are looked up, and must
+    # be kept in sync by removing node patches with 'remove_node_patch'.
+    def get_node_patch_index(self, schema_file):
+        file_id = schema_file.file_id
+        if file_id not in self.node_patch_index:
+            node_patch_index = {}
+            for unique_id in schema_file.node_patches:
+                parts = unique_id.split('.')
+                node_patch_index.setdefault((parts[0], parts[-1]), unique_id)
+            self.node_patch_index[file_id] = node_patch_index
+        return self.node_patch_index[file_id]
+
+    def remove_node_patch(self, schema_file, unique_id):
+        node_patch_index = self.get_node_patch_index(schema_file)
+        parts = unique_id.split('.')
+        if node_patch_index.get((parts[0], parts[-1])) == unique_id:
+            del node_patch_index[(parts[0], parts[-1])]
+        if unique_id in schema_file.node_patches:
+            schema_file.node_patches.remove(unique_id)
+
     def remove_tests(self, schema_file, dict_key, name):
         tests = schema_file.get_tests(dict_key, name)
-        for test_unique_id in tests:
-            if test_unique_id in self.saved_manifest.nodes:
-                node = self.saved_manifest.nodes.pop(test_unique_id)
-                self.deleted_manifest.nodes[test_unique_id] = node
+        saved_nodes = self.saved_manifest.nodes
+        self.move_to_deleted('nodes', [
+            test_unique_id for test_unique_id in tests if test_unique_id in saved_nodes
+        ])
         schema_file.remove_tests(dict_key, name)
 
+    # Remove a batch of entries from one of the saved manifest's dictionaries
+    # ('nodes', 'docs', etc) and record them as deleted
+    def move_to_deleted(self, manifest_attr, unique_ids):
+        saved = getattr(self.saved_manifest, manifest_attr)
+        for unique_id in unique_ids:
+            del saved[unique_id]
+        self.deleted[manifest_attr].update(unique_ids)
+
     def delete_schema_source(self, schema_file, source_dict):
         # both patches, tests, and source nodes
         source_name = source_dict['name']
         # There may be multiple sources for each source dict, since
         # there will be a separate source node for each table.
         # ParsedSourceDefinition name = table name, dict name is source_name
-        sources = schema_file.sources.copy()
-        for unique_id in sources:
+        source_index = self.get_source_index(schema_file)
+        deleted_sources = set()
+        for unique_id in source_index.pop(source_name, []):
             if unique_id in self.saved_manifest.sources:
-                source = self.saved_manifest.sources[unique_id]
-                if source.source_name == source_name:
-                    source = self.saved_manifest.sources.pop(unique_id)
-                    self.deleted_manifest.sources[unique_id] = source
-                    schema_file.sources.remove(unique_id)
-                    self.schedule_referencing_nodes_for_parsing(unique_id)
-                    logger.debug(f"Partial parsing: deleted source {unique_id}")
+                self.saved_manifest.sources.pop(unique_id)
+                deleted_sources.add(unique_id)
+                self.schedule_referencing_nodes_for_parsing(unique_id)
+                logger.debug(f"Partial parsing: deleted source {unique_id}")
+        # remove them all from the schema file at once, instead of one
+        # list.remove() per table
+        if deleted_sources:
+            self.deleted['sources'].update(deleted_sources)
+            schema_file.sources = [
+                unique_id for unique_id in schema_file.sources
+                if unique_id not in deleted_sources
+            ]
 
     def delete_schema_macro_patch(self, schema_file, macro):
         # This is just macro patches that need to be reapplied
@@ -684,7 +783,7 @@ class PartialParsing:
             del schema_file.macro_patches[macro['name']]
         if macro_unique_id and macro_unique_id in self.saved_manifest.macros:
             macro = self.saved_manifest.macros.pop(macro_unique_id)
-            self.deleted_manifest.macros[macro_unique_id] = macro
+            self.deleted['macros'].add(macro_unique_id)
             macro_file_id = macro.file_id
             if macro_file_id in self.new_files:
                 self.saved_files[macro_file_id] = self.new_files[macro_file_id]
@@ -694,15 +793,45 @@ class PartialParsing:
     # the exposure.
     def delete_schema_exposure(self, schema_file, exposure_dict):
         exposure_name = exposure_dict['name']
-        exposures = schema_file.exposures.copy()
-        for unique_id in exposures:
-            exposure = self.saved_manifest.exposures[unique_id]
-            if unique_id in self.saved_manifest.exposures:
-                if exposure.name == exposure_name:
-                    self.deleted_manifest.exposures[unique_id] = \
-                        self.saved_manifest.exposures.pop(unique_id)
-                    schema_file.exposures.remove(unique_id)
-                    logger.debug(f"Partial parsing: deleted exposure {unique_id}")
+        exposure_index = self.get_exposure_index(schema_file)
+        deleted_exposures = exposure_index.pop(exposure_name, [])
+        for unique_id in deleted_exposures:
+            self.saved_manifest.exposures.pop(unique_id)
+            logger.debug(f"Partial parsing: deleted exposure {unique_id}")
+        self.deleted['exposures'].update(deleted_exposures)
+        if deleted_exposures:
+            schema_file.exposures = [
+                unique_id for unique_id in schema_file.exposures
+                if unique_id not in deleted_exposures
+            ]
+
+    # The exposures in a schema file that are still in the saved manifest,
+    # by exposure name. Built the first time a schema file's exposures are
+    # looked up.
+    def get_exposure_index(self, schema_file):
+        file_id = schema_file.file_id
+        if file_id not in self.exposure_index:
+            exposure_index: Dict[str, List[str]] = {}
+            for unique_id in schema_file.exposures:
+                if unique_id in self.saved_manifest.exposures:
+                    exposure = self.saved_manifest.exposures[unique_id]
+                    exposure_index.setdefault(exposure.name, []).append(unique_id)
+            self.exposure_index[file_id] = exposure_index
+        return self.exposure_index[file_id]
+
+    # The sources in a schema file that are still in the saved manifest, by
+    # source name (one unique_id per table). Built the first time a schema
+    # file's sources are looked up.
+    def get_source_index(self, schema_file):
+        file_id = schema_file.file_id
+        if file_id not in self.source_index:
+            source_index: Dict[str, List[str]] = {}
+            for unique_id in schema_file.sources:
+                if unique_id in self.saved_manifest.sources:
+                    source = self.saved_manifest.sources[unique_id]
+                    source_index.setdefault(source.source_name, []).append(unique_id)
+            self.source_index[file_id] = source_index
+        return self.source_index[file_id]
 
     def get_schema_element(self, elem_list, elem_name):
         for element in elem_list:
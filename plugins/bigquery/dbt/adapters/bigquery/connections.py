@@ -569,6 +569,10 @@ class BigQueryConnectionManager(BaseConnectionManager):
             maximum=self.DEFAULT_MAXIMUM_DELAY)
 
     def _labels_from_query_comment(self, comment: str) -> Dict:
+        # only a JSON object can be turned into labels, so don't bother
+        # decoding comments that can't be one
+        if not comment or comment.lstrip()[:1] != '{':
+            return {'query_comment': _sanitize_label(comment)}
         try:
             comment_labels = json.loads(comment)
         except (TypeError, ValueError):
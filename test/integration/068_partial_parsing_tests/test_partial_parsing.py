@@ -3,24 +3,74 @@ from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.files import ParseFileType
 from dbt.contracts.results import TestStatus
 from test.integration.base import DBTIntegrationTest, use_profile, normalize
-import shutil
+import mmap
 import os
 
 
 # Note: every test case needs to have separate directories, otherwise
 # they will interfere with each other when tests are multi-threaded
 
+# The last manifest read by get_manifest, keyed by the path and the
+# (mtime, size) of the file it was read from. The tests often check the
+# manifest several times between dbt runs, so there's no need to decode it
+# again unless the file has been rewritten.
+_MANIFEST_CACHE = {}
+
+
 def get_manifest():
     path = './target/partial_parse.msgpack'
-    if os.path.exists(path):
-        with open(path, 'rb') as fp:
-            manifest_mp = fp.read()
-        manifest: Manifest = Manifest.from_msgpack(manifest_mp)
-        return manifest
-    else:
+    try:
+        fp = open(path, 'rb')
+    except FileNotFoundError:
         return None
+    with fp:
+        st = os.fstat(fp.fileno())
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key in _MANIFEST_CACHE:
+            return _MANIFEST_CACHE[key]
+        # map the file rather than reading it into a bytes copy; the decoder
+        # doesn't hold on to the buffer once it has built the manifest
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as manifest_mp:
+            manifest: Manifest = Manifest.from_msgpack(manifest_mp)
+    _MANIFEST_CACHE.clear()
+    _MANIFEST_CACHE[key] = manifest
+    return manifest
+
+
+# The contents of the files in extra-files, by file name. They are small and
+# most of them are copied into the project several times, so each one is only
+# read once.
+_EXTRA_FILES = {}
+EXTRA_FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extra-files')
+
+
+def copy_extra_file(name, dest):
+    if name not in _EXTRA_FILES:
+        with open(os.path.join(EXTRA_FILES_DIR, name), 'rb') as fp:
+            _EXTRA_FILES[name] = fp.read()
+    with open(dest, 'wb') as fp:
+        fp.write(_EXTRA_FILES[name])
+
+
+def remove_files(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
 
 class TestModels(DBTIntegrationTest):
+    SCHEMA_YML = normalize('models-a/schema.yml')
+    MODEL_THREE_SQL = normalize('models-a/model_three.sql')
+    MODEL_FOUR_SQL = normalize('models-a/model_four.sql')
+    MY_MACRO_SQL = normalize('macros/my_macro.sql')
+    MACROS_YML = normalize('macros/macros.yml')
+    MODEL_TWO_SQL = normalize('models-a/model_two.sql')
+    PARTIAL_PARSE_MSGPACK = normalize('target/partial_parse.msgpack')
+    ESCHEMA_YML = normalize('models-a/eschema.yml')
+    SCHEMA_FILE_ID = 'test://' + SCHEMA_YML
+    MODEL_THREE_FILE_ID = 'test://' + MODEL_THREE_SQL
 
     @property
     def schema(self):
@@ -39,38 +89,36 @@ class TestModels(DBTIntegrationTest):
         self.assertEqual(len(results), 1)
 
         # add a model file
-        shutil.copyfile('extra-files/model_two.sql', 'models-a/model_two.sql')
+        copy_extra_file('model_two.sql', 'models-a/model_two.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 2)
 
         # add a schema file
-        shutil.copyfile('extra-files/models-schema1.yml', 'models-a/schema.yml')
+        copy_extra_file('models-schema1.yml', 'models-a/schema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 2)
         manifest = get_manifest()
         self.assertIn('model.test.model_one', manifest.nodes)
         model_one_node = manifest.nodes['model.test.model_one']
         self.assertEqual(model_one_node.description, 'The first model')
-        self.assertEqual(model_one_node.patch_path, 'test://' + normalize('models-a/schema.yml'))
+        self.assertEqual(model_one_node.patch_path, self.SCHEMA_FILE_ID)
 
         # add a model and a schema file (with a test) at the same time
-        shutil.copyfile('extra-files/models-schema2.yml', 'models-a/schema.yml')
-        shutil.copyfile('extra-files/model_three.sql', 'models-a/model_three.sql')
+        copy_extra_file('models-schema2.yml', 'models-a/schema.yml')
+        copy_extra_file('model_three.sql', 'models-a/model_three.sql')
         results = self.run_dbt(["--partial-parse", "test"], expect_pass=False)
         self.assertEqual(len(results), 1)
         manifest = get_manifest()
         project_files = [f for f in manifest.files if f.startswith('test://')]
         self.assertEqual(len(project_files), 4)
-        model_3_file_id = 'test://' + normalize('models-a/model_three.sql')
-        self.assertIn(model_3_file_id, manifest.files)
-        model_three_file = manifest.files[model_3_file_id]
+        self.assertIn(self.MODEL_THREE_FILE_ID, manifest.files)
+        model_three_file = manifest.files[self.MODEL_THREE_FILE_ID]
         self.assertEqual(model_three_file.parse_file_type, ParseFileType.Model)
         self.assertEqual(type(model_three_file).__name__, 'SourceFile')
         model_three_node = manifest.nodes[model_three_file.nodes[0]]
-        schema_file_id = 'test://' + normalize('models-a/schema.yml')
-        self.assertEqual(model_three_node.patch_path, schema_file_id)
+        self.assertEqual(model_three_node.patch_path, self.SCHEMA_FILE_ID)
         self.assertEqual(model_three_node.description, 'The third model')
-        schema_file = manifest.files[schema_file_id]
+        schema_file = manifest.files[self.SCHEMA_FILE_ID]
         self.assertEqual(type(schema_file).__name__, 'SchemaSourceFile')
         self.assertEqual(len(schema_file.tests), 1)
         tests = schema_file.get_all_test_ids()
@@ -79,11 +127,10 @@ class TestModels(DBTIntegrationTest):
         self.assertIn(unique_test_id, manifest.nodes)
 
         # Change the model 3 test from unique to not_null
-        shutil.copyfile('extra-files/models-schema2b.yml', 'models-a/schema.yml')
+        copy_extra_file('models-schema2b.yml', 'models-a/schema.yml')
         results = self.run_dbt(["--partial-parse", "test"], expect_pass=False)
         manifest = get_manifest()
-        schema_file_id = 'test://' + normalize('models-a/schema.yml')
-        schema_file = manifest.files[schema_file_id]
+        schema_file = manifest.files[self.SCHEMA_FILE_ID]
         tests = schema_file.get_all_test_ids()
         self.assertEqual(tests, ['test.test.not_null_model_three_id.8f3f13afd0'])
         not_null_test_id = tests[0]
@@ -92,56 +139,55 @@ class TestModels(DBTIntegrationTest):
         self.assertEqual(len(results), 1)
 
         # go back to previous version of schema file, removing patch, test, and model for model three
-        shutil.copyfile('extra-files/models-schema1.yml', 'models-a/schema.yml')
-        os.remove(normalize('models-a/model_three.sql'))
+        copy_extra_file('models-schema1.yml', 'models-a/schema.yml')
+        os.remove(self.MODEL_THREE_SQL)
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 2)
 
         # remove schema file, still have 3 models
-        shutil.copyfile('extra-files/model_three.sql', 'models-a/model_three.sql')
-        os.remove(normalize('models-a/schema.yml'))
+        copy_extra_file('model_three.sql', 'models-a/model_three.sql')
+        os.remove(self.SCHEMA_YML)
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
         manifest = get_manifest()
-        schema_file_id = 'test://' + normalize('models-a/schema.yml')
-        self.assertNotIn(schema_file_id, manifest.files)
+        self.assertNotIn(self.SCHEMA_FILE_ID, manifest.files)
         project_files = [f for f in manifest.files if f.startswith('test://')]
         self.assertEqual(len(project_files), 3)
 
         # Put schema file back and remove a model
         # referred to in schema file
-        shutil.copyfile('extra-files/models-schema2.yml', 'models-a/schema.yml')
-        os.remove(normalize('models-a/model_three.sql'))
+        copy_extra_file('models-schema2.yml', 'models-a/schema.yml')
+        os.remove(self.MODEL_THREE_SQL)
         with self.assertRaises(CompilationException):
             results = self.run_dbt(["--partial-parse", "run"])
 
         # Put model back again
-        shutil.copyfile('extra-files/model_three.sql', 'models-a/model_three.sql')
+        copy_extra_file('model_three.sql', 'models-a/model_three.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Add model four refing model three
-        shutil.copyfile('extra-files/model_four1.sql', 'models-a/model_four.sql')
+        copy_extra_file('model_four1.sql', 'models-a/model_four.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 4)
 
         # Remove model_three and change model_four to ref model_one
         # and change schema file to remove model_three
-        os.remove(normalize('models-a/model_three.sql'))
-        shutil.copyfile('extra-files/model_four2.sql', 'models-a/model_four.sql')
-        shutil.copyfile('extra-files/models-schema1.yml', 'models-a/schema.yml')
+        os.remove(self.MODEL_THREE_SQL)
+        copy_extra_file('model_four2.sql', 'models-a/model_four.sql')
+        copy_extra_file('models-schema1.yml', 'models-a/schema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Remove model four, put back model three, put back schema file
-        shutil.copyfile('extra-files/model_three.sql', 'models-a/model_three.sql')
-        shutil.copyfile('extra-files/models-schema2.yml', 'models-a/schema.yml')
-        os.remove(normalize('models-a/model_four.sql'))
+        copy_extra_file('model_three.sql', 'models-a/model_three.sql')
+        copy_extra_file('models-schema2.yml', 'models-a/schema.yml')
+        os.remove(self.MODEL_FOUR_SQL)
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Add a macro
-        shutil.copyfile('extra-files/my_macro.sql', 'macros/my_macro.sql')
+        copy_extra_file('my_macro.sql', 'macros/my_macro.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
         manifest = get_manifest()
@@ -149,64 +195,71 @@ class TestModels(DBTIntegrationTest):
         self.assertIn(macro_id, manifest.macros)
 
         # Modify the macro
-        shutil.copyfile('extra-files/my_macro2.sql', 'macros/my_macro.sql')
+        copy_extra_file('my_macro2.sql', 'macros/my_macro.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Add a macro patch
-        shutil.copyfile('extra-files/models-schema3.yml', 'models-a/schema.yml')
+        copy_extra_file('models-schema3.yml', 'models-a/schema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Remove the macro
-        os.remove(normalize('macros/my_macro.sql'))
+        os.remove(self.MY_MACRO_SQL)
         with self.assertRaises(CompilationException):
             results = self.run_dbt(["--partial-parse", "run"])
 
         # put back macro file, got back to schema file with no macro
         # add separate macro patch schema file
-        shutil.copyfile('extra-files/models-schema2.yml', 'models-a/schema.yml')
-        shutil.copyfile('extra-files/my_macro.sql', 'macros/my_macro.sql')
-        shutil.copyfile('extra-files/macros.yml', 'macros/macros.yml')
+        copy_extra_file('models-schema2.yml', 'models-a/schema.yml')
+        copy_extra_file('my_macro.sql', 'macros/my_macro.sql')
+        copy_extra_file('macros.yml', 'macros/macros.yml')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # delete macro and schema file
         print(f"\n\n*** remove macro and macro_patch\n\n")
-        os.remove(normalize('macros/my_macro.sql'))
-        os.remove(normalize('macros/macros.yml'))
+        os.remove(self.MY_MACRO_SQL)
+        os.remove(self.MACROS_YML)
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Add an empty schema file
-        shutil.copyfile('extra-files/empty_schema.yml', 'models-a/eschema.yml')
+        copy_extra_file('empty_schema.yml', 'models-a/eschema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
         # Add version to empty schema file
-        shutil.copyfile('extra-files/empty_schema_with_version.yml', 'models-a/eschema.yml')
+        copy_extra_file('empty_schema_with_version.yml', 'models-a/eschema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 3)
 
     def tearDown(self):
-        if os.path.exists(normalize('models-a/model_two.sql')):
-            os.remove(normalize('models-a/model_two.sql'))
-        if os.path.exists(normalize('models-a/model_three.sql')):
-            os.remove(normalize('models-a/model_three.sql'))
-        if os.path.exists(normalize('models-a/model_four.sql')):
-            os.remove(normalize('models-a/model_four.sql'))
-        if os.path.exists(normalize('models-a/schema.yml')):
-            os.remove(normalize('models-a/schema.yml'))
-        if os.path.exists(normalize('target/partial_parse.msgpack')):
-            os.remove(normalize('target/partial_parse.msgpack'))
-        if os.path.exists(normalize('macros/my_macro.sql')):
-            os.remove(normalize('macros/my_macro.sql'))
-        if os.path.exists(normalize('models-a/eschema.yml')):
-            os.remove(normalize('models-a/eschema.yml'))
-        if os.path.exists(normalize('macros/macros.yml')):
-            os.remove(normalize('macros/macros.yml'))
+        remove_files(
+            self.MODEL_TWO_SQL,
+            self.MODEL_THREE_SQL,
+            self.MODEL_FOUR_SQL,
+            self.SCHEMA_YML,
+            self.PARTIAL_PARSE_MSGPACK,
+            self.MY_MACRO_SQL,
+            self.ESCHEMA_YML,
+            self.MACROS_YML,
+        )
 
 
 class TestSources(DBTIntegrationTest):
+    SOURCES_YML = normalize('models-b/sources.yml')
+    RAW_CUSTOMERS_CSV = normalize('seed/raw_customers.csv')
+    MORE_CUSTOMERS_CSV = normalize('seed/more_customers.csv')
+    CUSTOMERS_SQL = normalize('models-b/customers.sql')
+    EXPOSURES_YML = normalize('models-b/exposures.yml')
+    CUSTOMERS_MD = normalize('models-b/customers.md')
+    PARTIAL_PARSE_MSGPACK = normalize('target/partial_parse.msgpack')
+    MY_TEST_SQL = normalize('tests/my_test.sql')
+    MY_ANALYSIS_SQL = normalize('analysis/my_analysis.sql')
+    TESTS_SQL = normalize('macros-b/tests.sql')
+    SOURCES_FILE_ID = 'test://' + SOURCES_YML
+    RAW_CUSTOMERS_FILE_ID = 'test://' + RAW_CUSTOMERS_CSV
+    MORE_CUSTOMERS_FILE_ID = 'test://' + MORE_CUSTOMERS_CSV
 
     @property
     def schema(self):
@@ -231,112 +284,101 @@ class TestSources(DBTIntegrationTest):
         return cfg
 
     def tearDown(self):
-        if os.path.exists(normalize('models-b/sources.yml')):
-            os.remove(normalize('models-b/sources.yml'))
-        if os.path.exists(normalize('seed/raw_customers.csv')):
-            os.remove(normalize('seed/raw_customers.csv'))
-        if os.path.exists(normalize('seed/more_customers.csv')):
-            os.remove(normalize('seed/more_customers.csv'))
-        if os.path.exists(normalize('models-b/customers.sql')):
-            os.remove(normalize('models-b/customers.sql'))
-        if os.path.exists(normalize('models-b/exposures.yml')):
-            os.remove(normalize('models-b/exposures.yml'))
-        if os.path.exists(normalize('models-b/customers.md')):
-            os.remove(normalize('models-b/customers.md'))
-        if os.path.exists(normalize('target/partial_parse.msgpack')):
-            os.remove(normalize('target/partial_parse.msgpack'))
-        if os.path.exists(normalize('tests/my_test.sql')):
-            os.remove(normalize('tests/my_test.sql'))
-        if os.path.exists(normalize('analysis/my_analysis.sql')):
-            os.remove(normalize('analysis/my_analysis.sql'))
-        if os.path.exists(normalize('macros-b/tests.sql')):
-            os.remove(normalize('macros-b/tests.sql'))
+        remove_files(
+            self.SOURCES_YML,
+            self.RAW_CUSTOMERS_CSV,
+            self.MORE_CUSTOMERS_CSV,
+            self.CUSTOMERS_SQL,
+            self.EXPOSURES_YML,
+            self.CUSTOMERS_MD,
+            self.PARTIAL_PARSE_MSGPACK,
+            self.MY_TEST_SQL,
+            self.MY_ANALYSIS_SQL,
+            self.TESTS_SQL,
+        )
 
 
     @use_profile('postgres')
     def test_postgres_pp_sources(self):
         # initial run
         self.run_dbt(['clean'])
-        shutil.copyfile('extra-files/raw_customers.csv', 'seed/raw_customers.csv')
-        shutil.copyfile('extra-files/sources-tests1.sql', 'macros-b/tests.sql')
+        copy_extra_file('raw_customers.csv', 'seed/raw_customers.csv')
+        copy_extra_file('sources-tests1.sql', 'macros-b/tests.sql')
         results = self.run_dbt(["run"])
         self.assertEqual(len(results), 1)
 
         # Partial parse running 'seed'
         self.run_dbt(['--partial-parse', 'seed'])
         manifest = get_manifest()
-        seed_file_id = 'test://' + normalize('seed/raw_customers.csv')
-        self.assertIn(seed_file_id, manifest.files)
+        self.assertIn(self.RAW_CUSTOMERS_FILE_ID, manifest.files)
 
         # Add another seed file
-        shutil.copyfile('extra-files/raw_customers.csv', 'seed/more_customers.csv')
+        copy_extra_file('raw_customers.csv', 'seed/more_customers.csv')
         self.run_dbt(['--partial-parse', 'run'])
-        seed_file_id = 'test://' + normalize('seed/more_customers.csv')
         manifest = get_manifest()
-        self.assertIn(seed_file_id, manifest.files)
+        self.assertIn(self.MORE_CUSTOMERS_FILE_ID, manifest.files)
         seed_id = 'seed.test.more_customers'
         self.assertIn(seed_id, manifest.nodes)
 
         # Remove seed file and add a schema files with a source referring to raw_customers
-        os.remove(normalize('seed/more_customers.csv'))
-        shutil.copyfile('extra-files/schema-sources1.yml', 'models-b/sources.yml')
+        os.remove(self.MORE_CUSTOMERS_CSV)
+        copy_extra_file('schema-sources1.yml', 'models-b/sources.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         manifest = get_manifest()
         self.assertEqual(len(manifest.sources), 1)
-        file_id = 'test://' + normalize('models-b/sources.yml')
-        self.assertIn(file_id, manifest.files)
+        self.assertIn(self.SOURCES_FILE_ID, manifest.files)
 
         # add a model referring to raw_customers source
-        shutil.copyfile('extra-files/customers.sql', 'models-b/customers.sql')
+        copy_extra_file('customers.sql', 'models-b/customers.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 2)
 
         # remove sources schema file
-        os.remove(normalize('models-b/sources.yml'))
+        os.remove(self.SOURCES_YML)
         with self.assertRaises(CompilationException):
             results = self.run_dbt(["--partial-parse", "run"])
 
         # put back sources and add an exposures file
-        shutil.copyfile('extra-files/schema-sources2.yml', 'models-b/sources.yml')
+        copy_extra_file('schema-sources2.yml', 'models-b/sources.yml')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # remove seed referenced in exposures file
-        os.remove(normalize('seed/raw_customers.csv'))
+        os.remove(self.RAW_CUSTOMERS_CSV)
         with self.assertRaises(CompilationException):
             results = self.run_dbt(["--partial-parse", "run"])
 
         # put back seed and remove depends_on from exposure
-        shutil.copyfile('extra-files/raw_customers.csv', 'seed/raw_customers.csv')
-        shutil.copyfile('extra-files/schema-sources3.yml', 'models-b/sources.yml')
+        copy_extra_file('raw_customers.csv', 'seed/raw_customers.csv')
+        copy_extra_file('schema-sources3.yml', 'models-b/sources.yml')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Add seed config with test to schema.yml, remove exposure
-        shutil.copyfile('extra-files/schema-sources4.yml', 'models-b/sources.yml')
+        copy_extra_file('schema-sources4.yml', 'models-b/sources.yml')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Change seed name to wrong name
-        shutil.copyfile('extra-files/schema-sources5.yml', 'models-b/sources.yml')
+        copy_extra_file('schema-sources5.yml', 'models-b/sources.yml')
         with self.assertRaises(CompilationException):
             results = self.run_dbt(["--partial-parse", "run"])
 
         # Put back seed name to right name
-        shutil.copyfile('extra-files/schema-sources4.yml', 'models-b/sources.yml')
+        copy_extra_file('schema-sources4.yml', 'models-b/sources.yml')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Add docs file customers.md
-        shutil.copyfile('extra-files/customers1.md', 'models-b/customers.md')
+        copy_extra_file('customers1.md', 'models-b/customers.md')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Change docs file customers.md
-        shutil.copyfile('extra-files/customers2.md', 'models-b/customers.md')
+        copy_extra_file('customers2.md', 'models-b/customers.md')
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Delete docs file
-        os.remove(normalize('models-b/customers.md'))
+        os.remove(self.CUSTOMERS_MD)
         results = self.run_dbt(["--partial-parse", "run"])
 
         # Add a data test
-        shutil.copyfile('extra-files/my_test.sql', 'tests/my_test.sql')
+        copy_extra_file('my_test.sql', 'tests/my_test.sql')
         results = self.run_dbt(["--partial-parse", "test"])
         manifest = get_manifest()
         self.assertEqual(len(manifest.nodes), 9)
@@ -344,24 +386,24 @@ class TestSources(DBTIntegrationTest):
         self.assertIn(test_id, manifest.nodes)
 
         # Add an analysis
-        shutil.copyfile('extra-files/my_analysis.sql', 'analysis/my_analysis.sql')
+        copy_extra_file('my_analysis.sql', 'analysis/my_analysis.sql')
         results = self.run_dbt(["--partial-parse", "run"])
         manifest = get_manifest()
 
         # Remove data test
-        os.remove(normalize('tests/my_test.sql'))
+        os.remove(self.MY_TEST_SQL)
         results = self.run_dbt(["--partial-parse", "test"])
         manifest = get_manifest()
         self.assertEqual(len(manifest.nodes), 9)
 
         # Remove analysis
-        os.remove(normalize('analysis/my_analysis.sql'))
+        os.remove(self.MY_ANALYSIS_SQL)
         results = self.run_dbt(["--partial-parse", "run"])
         manifest = get_manifest()
         self.assertEqual(len(manifest.nodes), 8)
 
         # Change source test
-        shutil.copyfile('extra-files/sources-tests2.sql', 'macros-b/tests.sql')
+        copy_extra_file('sources-tests2.sql', 'macros-b/tests.sql')
         results = self.run_dbt(["--partial-parse", "run"])
 
 
@@ -386,8 +428,7 @@ class TestPartialParsingDependency(DBTIntegrationTest):
         }
 
     def tearDown(self):
-        if os.path.exists(normalize('models-c/schema.yml')):
-            os.remove(normalize('models-c/schema.yml'))
+        remove_files(normalize('models-c/schema.yml'))
 
     @use_profile("postgres")
     def test_postgres_parsing_with_dependency(self):
@@ -397,7 +438,7 @@ class TestPartialParsingDependency(DBTIntegrationTest):
         self.run_dbt(["run"])
 
         # Add a source override
-        shutil.copyfile('extra-files/schema-models-c.yml', 'models-c/schema.yml')
+        copy_extra_file('schema-models-c.yml', 'models-c/schema.yml')
         results = self.run_dbt(["--partial-parse", "run"])
         self.assertEqual(len(results), 2)
         manifest = get_manifest()
@@ -434,13 +475,12 @@ class TestMacros(DBTIntegrationTest):
         }
 
     def tearDown(self):
-        if os.path.exists(normalize('macros-macros/custom_schema_tests.sql')):
-            os.remove(normalize('macros-macros/custom_schema_tests.sql'))
+        remove_files(normalize('macros-macros/custom_schema_tests.sql'))
 
     @use_profile('postgres')
     def test_postgres_nested_macros(self):
 
-        shutil.copyfile('extra-files/custom_schema_tests1.sql', 'macros-macros/custom_schema_tests.sql')
+        copy_extra_file('custom_schema_tests1.sql', 'macros-macros/custom_schema_tests.sql')
         results = self.run_dbt(strict=False)
         self.assertEqual(len(results), 2)
         manifest = get_manifest()
@@ -457,7 +497,7 @@ class TestMacros(DBTIntegrationTest):
         self.assertEqual(results[1].status, TestStatus.Fail)
         self.assertEqual(results[1].node.config.severity, 'WARN')
 
-        shutil.copyfile('extra-files/custom_schema_tests2.sql', 'macros-macros/custom_schema_tests.sql')
+        copy_extra_file('custom_schema_tests2.sql', 'macros-macros/custom_schema_tests.sql')
         results = self.run_dbt(["--partial-parse", "test"], expect_pass=False)
         manifest = get_manifest()
         test_node_id = 'test.test.type_two_model_a_.05477328b9'
@@ -7,6 +7,7 @@ import re
 import pytest
 import unittest
 from contextlib import contextmanager
+from types import SimpleNamespace
 from requests.exceptions import ConnectionError
 from unittest.mock import patch, MagicMock, Mock, create_autospec, ANY
 
@@ -38,88 +39,93 @@ def _bq_conn():
 
 
 class BaseTestBigQueryAdapter(unittest.TestCase):
+    # The profile and project used by every test. These are only read (they
+    # are copied before being parsed), so they're built once for the class.
+    raw_profile = {
+        'outputs': {
+            'oauth': {
+                'type': 'bigquery',
+                'method': 'oauth',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'threads': 1,
+            },
+            'service_account': {
+                'type': 'bigquery',
+                'method': 'service-account',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'keyfile': '/tmp/dummy-service-account.json',
+                'threads': 1,
+            },
+            'loc': {
+                'type': 'bigquery',
+                'method': 'oauth',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'threads': 1,
+                'location': 'Luna Station',
+                'priority': 'batch',
+                'maximum_bytes_billed': 0,
+            },
+            'impersonate': {
+                'type': 'bigquery',
+                'method': 'oauth',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'threads': 1,
+                'impersonate_service_account': 'dummyaccount@dbt.iam.gserviceaccount.com'
+            },
+            'oauth-credentials-token': {
+                'type': 'bigquery',
+                'method': 'oauth-secrets',
+                'token': 'abc',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'threads': 1,
+                'location': 'Luna Station',
+                'priority': 'batch',
+                'maximum_bytes_billed': 0,
+            },
+            'oauth-credentials': {
+                'type': 'bigquery',
+                'method': 'oauth-secrets',
+                'client_id': 'abc',
+                'client_secret': 'def',
+                'refresh_token': 'ghi',
+                'token_uri': 'jkl',
+                'project': 'dbt-unit-000000',
+                'schema': 'dummy_schema',
+                'threads': 1,
+                'location': 'Luna Station',
+                'priority': 'batch',
+                'maximum_bytes_billed': 0,
+            },
+            'oauth-no-project': {
+                'type': 'bigquery',
+                'method': 'oauth',
+                'schema': 'dummy_schema',
+                'threads': 1,
+                'location': 'Solar Station',
+            },
+        },
+        'target': 'oauth',
+    }
+
+    project_cfg = {
+        'name': 'X',
+        'version': '0.1',
+        'project-root': '/tmp/dbt/does-not-exist',
+        'profile': 'default',
+        'config-version': 2,
+    }
+
+    # The RuntimeConfig for each target, built the first time a test asks for
+    # it. Tests only change the adapters they get, so the configs are shared.
+    _configs = {}
 
     def setUp(self):
         flags.STRICT_MODE = True
-
-        self.raw_profile = {
-            'outputs': {
-                'oauth': {
-                    'type': 'bigquery',
-                    'method': 'oauth',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                },
-                'service_account': {
-                    'type': 'bigquery',
-                    'method': 'service-account',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'keyfile': '/tmp/dummy-service-account.json',
-                    'threads': 1,
-                },
-                'loc': {
-                    'type': 'bigquery',
-                    'method': 'oauth',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                    'location': 'Luna Station',
-                    'priority': 'batch',
-                    'maximum_bytes_billed': 0,
-                },
-                'impersonate': {
-                    'type': 'bigquery',
-                    'method': 'oauth',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                    'impersonate_service_account': 'dummyaccount@dbt.iam.gserviceaccount.com'
-                },
-                'oauth-credentials-token': {
-                    'type': 'bigquery',
-                    'method': 'oauth-secrets',
-                    'token': 'abc',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                    'location': 'Luna Station',
-                    'priority': 'batch',
-                    'maximum_bytes_billed': 0,
-                },
-                'oauth-credentials': {
-                    'type': 'bigquery',
-                    'method': 'oauth-secrets',
-                    'client_id': 'abc',
-                    'client_secret': 'def',
-                    'refresh_token': 'ghi',
-                    'token_uri': 'jkl',
-                    'project': 'dbt-unit-000000',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                    'location': 'Luna Station',
-                    'priority': 'batch',
-                    'maximum_bytes_billed': 0,
-                },
-                'oauth-no-project': {
-                    'type': 'bigquery',
-                    'method': 'oauth',
-                    'schema': 'dummy_schema',
-                    'threads': 1,
-                    'location': 'Solar Station',
-                },
-            },
-            'target': 'oauth',
-        }
-
-        self.project_cfg = {
-            'name': 'X',
-            'version': '0.1',
-            'project-root': '/tmp/dbt/does-not-exist',
-            'profile': 'default',
-            'config-version': 2,
-        }
         self.qh_patch = None
 
     def tearDown(self):
@@ -127,173 +133,105 @@ class BaseTestBigQueryAdapter(unittest.TestCase):
             self.qh_patch.stop()
         super().tearDown()
 
-    def get_adapter(self, target):
-        project = self.project_cfg.copy()
-        profile = self.raw_profile.copy()
-        profile['target'] = target
+    def get_config(self, target):
+        if target not in self._configs:
+            project = self.project_cfg.copy()
+            profile = self.raw_profile.copy()
+            profile['target'] = target
 
-        config = config_from_parts_or_dicts(
-            project=project,
-            profile=profile,
-        )
+            self._configs[target] = config_from_parts_or_dicts(
+                project=project,
+                profile=profile,
+            )
+        return self._configs[target]
+
+    def get_adapter(self, target, *, install_query_header=True):
+        config = self.get_config(target)
         adapter = BigQueryAdapter(config)
 
-        adapter.connections.query_header = MacroQueryStringSetter(config, MagicMock(macros={}))
+        if install_query_header:
+            # the query header only reads the manifest's macros
+            manifest = SimpleNamespace(macros={})
+            adapter.connections.query_header = MacroQueryStringSetter(config, manifest)
 
-        self.qh_patch = patch.object(adapter.connections.query_header, 'add')
-        self.mock_query_header_add = self.qh_patch.start()
-        self.mock_query_header_add.side_effect = lambda q: '/* dbt */\n{}'.format(q)
+            self.qh_patch = patch.object(adapter.connections.query_header, 'add')
+            self.mock_query_header_add = self.qh_patch.start()
+            self.mock_query_header_add.side_effect = lambda q: '/* dbt */\n{}'.format(q)
 
         inject_adapter(adapter, BigQueryPlugin)
         return adapter
 
 
 class TestBigQueryAdapterAcquire(BaseTestBigQueryAdapter):
+    def _acquire_connection(self, adapter, mock_open_connection):
+        # Acquires a connection and checks that it validates, and that it
+        # isn't opened until its handle is used
+        connection = adapter.acquire_connection('dummy')
+        self.assertEqual(connection.type, 'bigquery')
+
+        mock_open_connection.assert_not_called()
+        connection.handle
+        mock_open_connection.assert_called_once()
+        return connection
+
     @patch('dbt.adapters.bigquery.connections.get_bigquery_defaults', return_value=('credentials', 'project_id'))
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_oauth_no_project_validations(self, mock_open_connection, mock_get_bigquery_defaults):
+        # this target's project comes from the (patched) google defaults, so
+        # its config has to be built inside this test
+        self._configs.pop('oauth-no-project', None)
         adapter = self.get_adapter('oauth-no-project')
         mock_get_bigquery_defaults.assert_called_once()
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_oauth_validations(self, mock_open_connection):
         adapter = self.get_adapter('oauth')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_service_account_validations(self, mock_open_connection):
         adapter = self.get_adapter('service_account')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_oauth_token_validations(self, mock_open_connection):
         adapter = self.get_adapter('oauth-credentials-token')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_oauth_credentials_validations(self, mock_open_connection):
         adapter = self.get_adapter('oauth-credentials')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_impersonated_service_account_validations(self, mock_open_connection):
         adapter = self.get_adapter('impersonate')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        except BaseException as e:
-            raise
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        self._acquire_connection(adapter, mock_open_connection)
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_priority(self, mock_open_connection):
         adapter = self.get_adapter('loc')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-            self.assertEqual(connection.credentials.priority, 'batch')
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        connection = self._acquire_connection(adapter, mock_open_connection)
+        self.assertEqual(connection.credentials.priority, 'batch')
 
     @patch('dbt.adapters.bigquery.BigQueryConnectionManager.open', return_value=_bq_conn())
     def test_acquire_connection_maximum_bytes_billed(self, mock_open_connection):
         adapter = self.get_adapter('loc')
-        try:
-            connection = adapter.acquire_connection('dummy')
-            self.assertEqual(connection.type, 'bigquery')
-            self.assertEqual(connection.credentials.maximum_bytes_billed, 0)
-
-        except dbt.exceptions.ValidationException as e:
-            self.fail('got ValidationException: {}'.format(str(e)))
-
-        mock_open_connection.assert_not_called()
-        connection.handle
-        mock_open_connection.assert_called_once()
+        connection = self._acquire_connection(adapter, mock_open_connection)
+        self.assertEqual(connection.credentials.maximum_bytes_billed, 0)
 
     def test_cancel_open_connections_empty(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         self.assertEqual(adapter.cancel_open_connections(), None)
 
     def test_cancel_open_connections_master(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         adapter.connections.thread_connections[0] = object()
         self.assertEqual(adapter.cancel_open_connections(), None)
 
     def test_cancel_open_connections_single(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         adapter.connections.thread_connections.update({
             0: object(),
             1: object(),
@@ -320,10 +258,11 @@ class TestBigQueryAdapterAcquire(BaseTestBigQueryAdapter):
 
 class HasUserAgent:
     PAT = re.compile(r'dbt-\d+\.\d+\.\d+((a|b|rc)\d+)?')
+    _match = PAT.match
 
     def __eq__(self, other):
         compare = getattr(other, 'user_agent', '')
-        return bool(self.PAT.match(compare))
+        return bool(HasUserAgent._match(compare))
 
 
 class TestConnectionNamePassthrough(BaseTestBigQueryAdapter):
@@ -522,11 +461,10 @@ class TestBigQueryConnectionManager(unittest.TestCase):
 
         self.connections.get_thread_connection = lambda: self.mock_connection
 
+    @patch('google.api_core.retry.time.sleep')
     @patch(
         'dbt.adapters.bigquery.connections._is_retryable', return_value=True)
-    def test_retry_and_handle(self, is_retryable):
-        self.connections.DEFAULT_MAXIMUM_DELAY = 2.0
-
+    def test_retry_and_handle(self, is_retryable, mock_sleep):
         @contextmanager
         def dummy_handler(msg):
             yield
@@ -547,14 +485,16 @@ class TestBigQueryConnectionManager(unittest.TestCase):
             self.connections._retry_and_handle(
                  "some sql", Mock(credentials=Mock(retries=8)),
                  raiseDummyException)
-            self.assertEqual(DummyException.count, 9)
+        self.assertEqual(DummyException.count, 9)
+        # backed off between each attempt, without actually sleeping
+        self.assertEqual(mock_sleep.call_count, 8)
 
+    @patch('google.api_core.retry.time.sleep')
     @patch(
         'dbt.adapters.bigquery.connections._is_retryable', return_value=True)
-    def test_retry_connection_reset(self, is_retryable):
+    def test_retry_connection_reset(self, is_retryable, mock_sleep):
         self.connections.open = MagicMock()
         self.connections.close = MagicMock()
-        self.connections.DEFAULT_MAXIMUM_DELAY = 2.0
 
         @contextmanager
         def dummy_handler(msg):
@@ -644,8 +584,14 @@ class TestBigQueryConnectionManager(unittest.TestCase):
         self.assertEqual(labels, expected)
 
     def test_job_labels_invalid_json(self):
-        labels = self.connections._labels_from_query_comment("not json")
+        with patch('dbt.adapters.bigquery.connections.json.loads') as mock_loads:
+            labels = self.connections._labels_from_query_comment("not json")
         self.assertEqual(labels, {"query_comment": "not_json"})
+        mock_loads.assert_not_called()
+
+    def test_job_labels_json_not_object(self):
+        labels = self.connections._labels_from_query_comment("[1, 2]")
+        self.assertEqual(labels, {"query_comment": "_1__2_"})
 
     def _table_ref(self, proj, ds, table, conn):
         return google.cloud.bigquery.table.TableReference.from_string(
@@ -663,7 +609,7 @@ class TestBigQueryConnectionManager(unittest.TestCase):
 class TestBigQueryAdapter(BaseTestBigQueryAdapter):
 
     def test_copy_table_materialization_table(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         adapter.connections = MagicMock()
         adapter.copy_table('source', 'destination', 'table')
         adapter.connections.copy_bq_table.assert_called_once_with(
@@ -671,7 +617,7 @@ class TestBigQueryAdapter(BaseTestBigQueryAdapter):
             dbt.adapters.bigquery.impl.WRITE_TRUNCATE)
 
     def test_copy_table_materialization_incremental(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         adapter.connections = MagicMock()
         adapter.copy_table('source', 'destination', 'incremental')
         adapter.connections.copy_bq_table.assert_called_once_with(
@@ -687,131 +633,37 @@ class TestBigQueryAdapter(BaseTestBigQueryAdapter):
         with self.assertRaises(dbt.exceptions.CompilationException):
             adapter.parse_partition_by("ts")
 
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "day"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "date",
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "day"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "MONTH"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "MONTH"
-            }
-        )
-        
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "YEAR"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "date",
-                "granularity": "YEAR"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "HOUR"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "HOUR"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "MONTH"
-
-            }).to_dict(omit_none=True
-                ), {
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "MONTH"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "YEAR"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "timestamp",
-                "granularity": "YEAR"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "datetime",
-                "granularity": "HOUR"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "datetime",
-                "granularity": "HOUR"
-            }
-        )
-
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "datetime",
-                "granularity": "MONTH"
-
-            }).to_dict(omit_none=True), {
+        # (partition_by, expected parsed config)
+        cases = [
+            ({"field": "ts"},
+             {"field": "ts", "data_type": "date", "granularity": "day"}),
+            ({"field": "ts", "data_type": "date"},
+             {"field": "ts", "data_type": "date", "granularity": "day"}),
+        ]
+        # the rest are already complete, and parse to themselves
+        for data_type, granularity in [
+            ("date", "MONTH"),
+            ("date", "YEAR"),
+            ("timestamp", "HOUR"),
+            ("timestamp", "MONTH"),
+            ("timestamp", "YEAR"),
+            ("datetime", "HOUR"),
+            ("datetime", "MONTH"),
+            ("datetime", "YEAR"),
+        ]:
+            partition_by = {
                 "field": "ts",
-                "data_type": "datetime",
-                "granularity": "MONTH"
+                "data_type": data_type,
+                "granularity": granularity
             }
-        )
+            cases.append((partition_by, partition_by.copy()))
 
-        self.assertEqual(
-            adapter.parse_partition_by({
-                "field": "ts",
-                "data_type": "datetime",
-                "granularity": "YEAR"
-
-            }).to_dict(omit_none=True), {
-                "field": "ts",
-                "data_type": "datetime",
-                "granularity": "YEAR"
-            }
-        )
+        for partition_by, expected in cases:
+            self.assertEqual(
+                adapter.parse_partition_by(partition_by).to_dict(omit_none=True),
+                expected,
+                msg=f"partition_by: {partition_by}"
+            )
 
         # Invalid, should raise an error
         with self.assertRaises(dbt.exceptions.CompilationException):
@@ -841,11 +693,11 @@ class TestBigQueryAdapter(BaseTestBigQueryAdapter):
         )
 
     def test_hours_to_expiration(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         mock_config = create_autospec(
-            RuntimeConfigObject)
+            RuntimeConfigObject, instance=True)
         config = {'hours_to_expiration': 4}
-        mock_config.get.side_effect = lambda name: config.get(name)
+        mock_config.get.side_effect = config.get
 
         expected = {
             'expiration_timestamp': 'TIMESTAMP_ADD(CURRENT_TIMESTAMP(), INTERVAL 4 hour)',
@@ -855,11 +707,11 @@ class TestBigQueryAdapter(BaseTestBigQueryAdapter):
 
 
     def test_hours_to_expiration_temporary(self):
-        adapter = self.get_adapter('oauth')
+        adapter = self.get_adapter('oauth', install_query_header=False)
         mock_config = create_autospec(
-            RuntimeConfigObject)
-        config={'hours_to_expiration': 4}
-        mock_config.get.side_effect = lambda name: config.get(name)
+            RuntimeConfigObject, instance=True)
+        config = {'hours_to_expiration': 4}
+        mock_config.get.side_effect = config.get
 
         expected = {
             'expiration_timestamp': (
@@ -881,17 +733,17 @@ class TestBigQueryFilterCatalog(unittest.TestCase):
             ['foo', 'c', 'B', '1234'],  # skip
             ['1234', 'A', 'B', '1234'],  # include, w/ table name as str
         ]
+        # the column types are known, so don't make agate infer them
         table = agate.Table(
-            rows, column_names, agate_helper.DEFAULT_TYPE_TESTER
+            rows, column_names,
+            [agate.Text(), agate.Text(), agate.Text(), agate.Number()]
         )
 
         result = BigQueryAdapter._catalog_filter_table(table, manifest)
         assert len(result) == 3
-        for row in result.rows:
-            assert isinstance(row['table_schema'], str)
-            assert isinstance(row['table_database'], str)
-            assert isinstance(row['table_name'], str)
-            assert isinstance(row['something'], decimal.Decimal)
+        for column_name in ('table_schema', 'table_database', 'table_name'):
+            assert all(isinstance(v, str) for v in result.columns[column_name].values())
+        assert all(isinstance(v, decimal.Decimal) for v in result.columns['something'].values())
 
 
 class TestBigQueryAdapterConversions(TestAdapterConversions):
@@ -976,15 +828,22 @@ def test_sanitize_label(input, output):
     assert _sanitize_label(input) == output
 
 
+LABEL_CHARS = string.ascii_uppercase + string.digits
+# (label_length, label) pairs, generated once from a fixed seed so that every
+# run checks the same labels
+_label_random = random.Random(0)
+LONG_LABELS = [
+    (label_length, "".join(_label_random.choices(LABEL_CHARS, k=label_length)))
+    for label_length in (64, 65, 100)
+]
+
+
 @pytest.mark.parametrize(
-    "label_length",
-    [64, 65, 100],
+    ["label_length", "random_string"],
+    LONG_LABELS,
+    ids=[str(label_length) for label_length, _ in LONG_LABELS],
 )
-def test_sanitize_label_length(label_length):
-    random_string = "".join(
-        random.choice(string.ascii_uppercase + string.digits)
-        for i in range(label_length)
-    )
+def test_sanitize_label_length(label_length, random_string):
     test_error_msg = (
             f"Job label length {label_length} is greater than length limit: "
             f"{_VALIDATE_LABEL_LENGTH_LIMIT}\n"
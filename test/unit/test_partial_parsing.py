@@ -79,3 +79,53 @@ class TestPartialParsing(unittest.TestCase):
         expected_pp_dict = {'version': 2, 'models': [{'name': 'my_model', 'description': 'Test model'}]}
         schema_file = self.saved_files[schema_file_id]
         self.assertEqual(schema_file.pp_dict, expected_pp_dict)
+
+    def test_schema_file_test_index(self):
+        schema_file_id = 'my_test://' + normalize('models/schema.yml')
+        schema_file = self.saved_files[schema_file_id]
+        schema_file.add_test('test.my_test.not_null_my_model_id', {'key': 'models', 'name': 'my_model'})
+        self.assertEqual(
+            schema_file.get_key_and_name_for_test('test.my_test.not_null_my_model_id'),
+            ('models', 'my_model')
+        )
+        # tests added after the index has been built are found too
+        schema_file.add_test('test.my_test.unique_my_model_id', {'key': 'models', 'name': 'my_model'})
+        self.assertEqual(
+            schema_file.get_key_and_name_for_test('test.my_test.unique_my_model_id'),
+            ('models', 'my_model')
+        )
+        schema_file.remove_tests('models', 'my_model')
+        self.assertEqual(
+            schema_file.get_key_and_name_for_test('test.my_test.unique_my_model_id'),
+            (None, None)
+        )
+
+    def test_changed_schema_file(self):
+        schema_file_id = 'my_test://' + normalize('models/schema.yml')
+        model_file_id = 'my_test://' + normalize('models/my_model.sql')
+        new_schema_file = self.partial_parsing.new_files[schema_file_id]
+        new_schema_file.checksum = FileHash.from_contents('mnopqr')
+        new_schema_file.dfy = {'version': 2, 'models': [{'name': 'my_model', 'description': 'Changed'}]}
+        self.partial_parsing.build_file_diff()
+        self.assertEqual(self.partial_parsing.file_diff['changed_schema_files'], [schema_file_id])
+
+        pp_files = self.partial_parsing.get_parsing_files()
+        # the patched model node is removed, and its file scheduled for parsing
+        expected_pp_files = {'my_test': {'SchemaParser': [schema_file_id], 'ModelParser': [model_file_id]}}
+        self.assertEqual(pp_files, expected_pp_files)
+        self.assertNotIn('model.my_test.my_model', self.saved_manifest.nodes)
+        schema_file = self.saved_files[schema_file_id]
+        self.assertEqual(schema_file.node_patches, [])
+        expected_pp_dict = {'version': 2, 'models': [{'name': 'my_model', 'description': 'Changed'}]}
+        self.assertEqual(schema_file.pp_dict, expected_pp_dict)
+
+    def test_changed_model_without_schema_element(self):
+        # the model's patch_path points to a schema file that no longer has
+        # an entry for it
+        schema_file_id = 'my_test://' + normalize('models/schema.yml')
+        model_file_id = 'my_test://' + normalize('models/my_model.sql')
+        self.saved_files[schema_file_id].dfy = {'version': 2}
+        self.partial_parsing.new_files[model_file_id].checksum = FileHash.from_contents('xyzabc')
+        self.partial_parsing.build_file_diff()
+        pp_files = self.partial_parsing.get_parsing_files()
+        self.assertEqual(pp_files, {'my_test': {'ModelParser': [model_file_id]}})